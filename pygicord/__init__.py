@@ -23,7 +23,8 @@ SOFTWARE.
 """
 
 import asyncio
-from typing import List, Union
+from types import MappingProxyType
+from typing import List, Union, Optional
 from contextlib import suppress
 
 import discord
@@ -32,7 +33,42 @@ from asyncio import AbstractEventLoop
 from discord_slash import SlashContext
 from discord_slash.model import SlashMessage
 
-IMAGE_PROPERTIES = frozenset({'image', 'thumbnail', 'author', 'footer'})
+try:
+    from asyncio import timeout
+except ImportError:  # Python < 3.11
+    from async_timeout import timeout
+
+
+def _set_image(embed: discord.Embed, url: str):
+    embed.set_image(url=url)
+
+
+def _set_thumbnail(embed: discord.Embed, url: str):
+    embed.set_thumbnail(url=url)
+
+
+def _set_author(embed: discord.Embed, url: str):
+    if hasattr(embed, "_author"):
+        embed._author["icon_url"] = url
+
+
+def _set_footer(embed: discord.Embed, url: str):
+    if hasattr(embed, "_footer"):
+        embed._footer["icon_url"] = url
+
+
+# discord.py 2.0 raises ValueError where 1.x raised InvalidArgument
+_INVALID_ARGUMENT = getattr(discord, "InvalidArgument", ValueError)
+
+# Maps a file name prefix to the embed property the file is bound to
+IMAGE_PROPERTIES = {
+    "image": _set_image,
+    "thumbnail": _set_thumbnail,
+    "author": _set_author,
+    "footer": _set_footer,
+}
+
+
 class Paginator:
     """A pagination wrapper that allows to move between multiple pages by using reactions.
 
@@ -51,6 +87,14 @@ class Paginator:
     has_input: :class:`bool`.
         Whether the paginator should add a reaction for taking input
         numbers. Defaults to ``True``.
+    files: Optional[:class:`List[discord.File]`]
+        The files to show on each page, in the same order as the pages.
+        A file is bound to the embed property its name starts with:
+        ``image``, ``thumbnail``, ``author`` or ``footer``. Up to 10 files
+        are uploaded together with the first page, so they count against a
+        single upload size limit and the other pages' files stay attached to
+        the message. With more than 10 files, only the first page gets its
+        file.
     """
 
     __slots__ = (
@@ -66,13 +110,32 @@ class Paginator:
         "bot",
         "loop",
         "current",
-        "previous",
         "end",
         "reactions",
+        "_valid",
+        "_cdn_urls",
+        "_prepared",
+        "_uploads",
+        "_queue",
+        "_reactions_added",
         "__tasks",
         "__is_running",
     )
 
+    # Reactions added for each configuration, in display order, indexed by
+    # (compact << 1) | has_input. Compact paginators never take input.
+    _REACTIONS = (
+        ("⏮", "◀", "⏹️", "▶", "⏭"),
+        ("⏮", "◀", "⏹️", "▶", "⏭", "🔢"),
+        ("◀", "⏹️", "▶"),
+        ("◀", "⏹️", "▶"),
+    )
+    # Emojis accepted by check() for each of the configurations above
+    _VALID = tuple(frozenset(reactions) for reactions in _REACTIONS)
+    _REACTION_EVENTS = ("raw_reaction_add", "raw_reaction_remove")
+    # Maximum number of files Discord accepts on a single message
+    _MAX_FILES = 10
+
     def __init__(
         self,
         *,
@@ -96,74 +159,100 @@ class Paginator:
         self.message: Union[SlashMessage, discord.Message] = None
 
         self.current = 0
-        self.previous = 0
         self.end = 0
-        self.reactions = {
-            "⏮": 0.0,
-            "◀": -1,
-            "⏹️": "stop",
-            "▶": +1,
-            "⏭": None,
-        }
+
+        self._cdn_urls = {}
+        self._prepared = []
+        self._uploads: List[discord.File] = None
+        self._queue: asyncio.Queue = None
+        self._reactions_added = False
 
         self.__tasks = []
         self.__is_running = True
 
-        if self.has_input is True:
-            self.reactions["🔢"] = "input"
-
         if self.pages:
+            if not all(isinstance(x, discord.Embed) for x in self.pages):
+                raise TypeError(
+                    "Can't paginate an instance of <class '%s'>."
+                    % self.pages.__class__.__name__
+                )
+
             if len(self.pages) == 2:
                 self.compact = True
 
-        if self.compact:
-            for key in ("⏮", "⏭", "🔢"): del self.reactions[key]
+        index = (bool(self.compact) << 1) | (self.has_input is True)
+        self.reactions = self._REACTIONS[index]
+        self._valid = self._VALID[index]
 
-    def go_to_page(self, number):
-        if number > int(self.end):
-            page = int(self.end)
-        else:
-            page = number - 1
-        self.current = page
+    def go_to_page(self, number: int) -> int:
+        # Page numbers typed by the user start from 1
+        return min(max(number - 1, 0), self.end)
 
-    async def controller(self, react):
-        if react == "stop":
-            await self.stop()
+    # Each handler returns the index of the page to show, or None
+    async def _go_first(self):
+        return 0
 
-        elif react == "input":
-            to_delete = []
-            message: Union[SlashMessage, discord.Message] = await self.ctx.send("What page do you want to go to?")
-            to_delete.append(message)
+    async def _go_prev(self):
+        return max(self.current - 1, 0)
 
-            def check(m: discord.Message):
-                if m.author.id != self.ctx.author.id:
-                    return False
-                elif self.ctx.channel.id != m.channel.id:
-                    return False
-                elif not m.content.isdigit():
-                    return False
-                return True
-
-            try:
-                message = await self.bot.wait_for("message", check=check, timeout=30.0)
-            except asyncio.TimeoutError:
-                to_delete.append(
-                    await self.ctx.send("You took too long to enter a number.")
-                )
-                await asyncio.sleep(5)
-            else:
-                to_delete.append(message)
-                self.go_to_page(int(message.content))
+    async def _do_stop(self):
+        await self.stop()
 
-            with suppress(Exception):
-                await self.ctx.channel.delete_messages(to_delete)
+    async def _go_next(self):
+        return min(self.current + 1, self.end)
+
+    async def _go_last(self):
+        return self.end
 
-        elif isinstance(react, int):
-            self.current += react
-            if self.current < 0 or self.current > self.end:
-                self.current -= react
+    async def _do_input(self):
+        page = None
+        to_delete = []
+        message: Union[SlashMessage, discord.Message] = await self.ctx.send("What page do you want to go to?")
+        to_delete.append(message)
+
+        author_id = self.ctx.author.id
+        channel_id = self.ctx.channel.id
+
+        def check(m: discord.Message):
+            return (
+                m.author.id == author_id
+                and m.channel.id == channel_id
+                and m.content.isdecimal()
+            )
+
+        try:
+            message = await self.bot.wait_for("message", check=check, timeout=30.0)
+        except asyncio.TimeoutError:
+            to_delete.append(
+                await self.ctx.send("You took too long to enter a number.")
+            )
+            await asyncio.sleep(5)
         else:
-            self.current = int(react)
+            to_delete.append(message)
+            page = self.go_to_page(int(message.content))
+
+        with suppress(Exception):
+            await self.ctx.channel.delete_messages(to_delete)
+
+        return page
+
+    _DISPATCH = MappingProxyType(
+        {
+            "⏮": _go_first,
+            "◀": _go_prev,
+            "⏹️": _do_stop,
+            "▶": _go_next,
+            "⏭": _go_last,
+            "🔢": _do_input,
+        }
+    )
+
+    async def controller(self, emoji: str) -> Optional[int]:
+        """Handle a reaction and return the page to show, if it has changed."""
+        page = await self._DISPATCH[emoji](self)
+        if page == self.current:
+            return None
+        return page
 
     # https://discordpy.readthedocs.io/en/latest/api.html#discord.RawReactionActionEvent
     def check(self, payload: discord.RawReactionActionEvent):
@@ -172,88 +261,117 @@ class Paginator:
         if payload.user_id != self.ctx.author.id:
             return False
 
-        return str(payload.emoji) in self.reactions
+        emoji = payload.emoji
+        # The name of a unicode emoji is the emoji itself
+        key = emoji.name if emoji.id is None else str(emoji)
+        return key in self._valid
+
+    def _enqueue(self, payload: discord.RawReactionActionEvent):
+        """Check for the reaction waiters, queueing the payloads that match.
+
+        It always returns ``False`` on purpose: the waiter never resolves and
+        keeps receiving reactions until it is cancelled by :meth:`stop`.
+        Errors are suppressed too, as discord.py would otherwise resolve the
+        waiter with them and the session would stop receiving reactions.
+        """
+        with suppress(Exception):
+            if self.check(payload):
+                self._queue.put_nowait(payload)
+        return False
+
+    def add_waiters(self):
+        self._queue = asyncio.Queue()
+        for event in self._REACTION_EVENTS:
+            waiter = self.bot.wait_for(event, check=self._enqueue)
+            self.__tasks.append(self.loop.create_task(waiter))
+
+    async def _safe_add(self, reaction: str):
+        with suppress(discord.Forbidden, discord.HTTPException):
+            await self.message.add_reaction(reaction)
+            self._reactions_added = True
 
     async def add_reactions(self):
-        for reaction in self.reactions:
-            with suppress(discord.Forbidden, discord.HTTPException):
-                await self.message.add_reaction(reaction)
+        await asyncio.gather(
+            *(self._safe_add(reaction) for reaction in self.reactions),
+            return_exceptions=True,
+        )
 
-    async def embed_setter(self, index: int = 0) -> tuple[discord.Embed, discord.File]:
+    def embed_setter(self, index: int = 0) -> discord.Embed:
         embed = self.pages[index]
-        if self.files:
-            if len(self.files) >= index:
-                return embed, None
-            file = self.files[index]
-            URL = f'attachment://{file.filename}'
-            if file.filename.startswith('image'):
-                embed.set_image(url=URL)
-            elif file.filename.startswith('thumbnail'):
-                embed.set_thumbnail(url=URL)
-            elif file.filename.startswith('author') and hasattr(embed, '_author'):
-                embed._author['icon_url'] = URL
-            elif file.filename.startswith('footer') and hasattr(embed, '_footer'):
-                embed._footer['icon_url'] = URL
-            return embed, file
-        return embed, None
+        if self._uploads and index < len(self._uploads):
+            filename = self._uploads[index].filename
+            URL = self._cdn_urls.get(index, f'attachment://{filename}')
+            for prefix, setter in IMAGE_PROPERTIES.items():
+                if filename.startswith(prefix):
+                    setter(embed, URL)
+                    break
+        return embed
+
+    def cache_attachments(self, message: Union[SlashMessage, discord.Message]):
+        # Attachments are returned in the order the files were uploaded
+        for index, attachment in enumerate(message.attachments):
+            self._cdn_urls[index] = attachment.url
+            self._prepared[index] = self.embed_setter(index)
     
     async def paginator(self):
-        with suppress(discord.HTTPException, discord.Forbidden):
-            embed, file = await self.embed_setter(0)
-            self.message = await self.ctx.send(embed=embed, file=file)
+        try:
+            self.message = await self.ctx.send(
+                embed=self._prepared[0], files=self._uploads
+            )
+        except (discord.HTTPException, _INVALID_ARGUMENT, ValueError):
+            # The files may be what was rejected, try again without them
+            with suppress(discord.HTTPException, discord.Forbidden):
+                self.message = await self.ctx.send(embed=self._prepared[0])
+        else:
+            if self._uploads:
+                self.cache_attachments(self.message)
 
-        if len(self.pages) > 1:
-            self.__tasks.append(self.loop.create_task(self.add_reactions()))
+        if self.message is None:
+            return
 
-        while self.__is_running:
-            with suppress(Exception):
-                tasks = [
-                    asyncio.ensure_future(
-                        self.bot.wait_for("raw_reaction_add", check=self.check)
-                    ),
-                    asyncio.ensure_future(
-                        self.bot.wait_for("raw_reaction_remove", check=self.check)
-                    ),
-                ]
-
-                done, pending = await asyncio.wait(
-                    tasks, timeout=self.timeout, return_when=asyncio.FIRST_COMPLETED
-                )
+        self.add_waiters()
+        await self.add_reactions()
 
-                for task in pending:
-                    task.cancel()
+        get_payload = self._queue.get
+        controller = self.controller
+        prepared = self._prepared
+        message = self.message
+        delay = self.timeout
 
-                if len(done) == 0:
+        while self.__is_running:
+            with suppress(Exception):
+                try:
+                    async with timeout(delay):
+                        payload: discord.RawReactionActionEvent = await get_payload()
+                except asyncio.TimeoutError:
                     # Clear reactions once the timeout has elapsed
                     return await self.stop(timed_out=True)
 
-                payload: discord.RawReactionActionEvent = done.pop().result()
-                reaction = self.reactions.get(str(payload.emoji))
-
-                self.previous = self.current
-                await self.controller(reaction)
-
-                if self.previous == self.current:
+                page = await controller(str(payload.emoji))
+                if page is None:
                     continue
 
                 with suppress(Exception):
-                    embed, file = await self.embed_setter(self.current)
-                    if file:
-                        await self.message.edit(embed=embed, file=file)
-                    else:
-                        await self.message.edit(embed=embed)
+                    await message.edit(embed=prepared[page])
+                    self.current = page
 
     async def stop(self, *, timed_out=False):
         with suppress(discord.HTTPException, discord.Forbidden):
             if timed_out:
-                await self.message.clear_reactions()
+                # Nothing to clear if every reaction failed to be added
+                if self._reactions_added:
+                    await self.message.clear_reactions()
             else:
                 await self.message.delete()
 
         with suppress(Exception):
             self.__is_running = False
-            for task in self.__tasks:
+            # A task can't wait on itself
+            current = asyncio.current_task()
+            tasks = [task for task in self.__tasks if task is not current]
+            for task in tasks:
                 task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
             self.__tasks.clear()
 
     async def start(self, ctx: Union[Context, SlashContext]):
@@ -268,20 +386,18 @@ class Paginator:
         self.bot = ctx.bot
         self.loop = ctx.bot.loop
 
-        if not all(isinstance(x, discord.Embed) for x in self.pages):
-            raise TypeError(
-                "Can't paginate an instance of <class '%s'>."
-                % self.pages.__class__.__name__
-            )
+        if not self.pages:
+            raise RuntimeError("Can't paginate an empty list.")
 
-        if len(self.pages) == 1:
+        elif len(self.pages) == 1:
             return await self.ctx.send(embed=self.pages[0], files=self.files)
 
-        elif len(self.pages) == 0:
-            raise RuntimeError("Can't paginate an empty list.")
-
         else:
-            self.end = float(len(self.pages) - 1)
-            if self.compact is False:
-                self.reactions["⏭"] = self.end
+            self.end = len(self.pages) - 1
+            if self.files:
+                uploads = self.files[: len(self.pages)]
+                if len(uploads) > self._MAX_FILES:
+                    uploads = uploads[:1]
+                self._uploads = uploads
+            self._prepared = [self.embed_setter(i) for i in range(len(self.pages))]
             self.__tasks.append(self.loop.create_task(self.paginator()))